@@ -9,9 +9,10 @@ bl_info = {
 }
 
 import bpy
-import bmesh
+import functools
 import os
 import re
+import numpy as np
 from mathutils import Vector
 from bpy.props import (
     StringProperty,
@@ -22,120 +23,367 @@ from bpy.props import (
 )
 from bpy_extras.io_utils import ImportHelper
 
+# Precompiled patterns used by the parsers
+_RE_ADD = re.compile(rb'%ADD(\d+)([CRO])(.*?)\*%')
+_RE_FS = re.compile(rb'%FSLAX(\d)(\d)Y(\d)(\d)\*%')
+# Operation line: optional G01-G03 prefix, X/Y coordinates, arc offsets, D01-D03
+_RE_OP = re.compile(rb'(?:G0?[123])?(?:X([+-]?\d+))?(?:Y([+-]?\d+))?(?:I[+-]?\d+)?(?:J[+-]?\d+)?D0([123])\*?')
+_RE_TC = re.compile(rb'T(\d+)C([\d.]+)')
+_RE_XFLOAT = re.compile(rb'X([+-]?[\d.]+)')
+_RE_YFLOAT = re.compile(rb'Y([+-]?[\d.]+)')
+# Aperture definitions anywhere in a file, for the compiled parser
+_RE_ADD_BLOCK = re.compile(rb'%ADD[^%]*%')
+
+# Compiled Gerber operation scanner (optional, Blender does not bundle numba)
+def _scan_int(buf, i, end):
+    """Scan [+-]?digits at buf[i]; returns (value, next index, digit count)"""
+    negative = False
+    if i < end and (buf[i] == 43 or buf[i] == 45):  # '+' or '-'
+        negative = buf[i] == 45
+        i += 1
+    value = 0
+    digits = 0
+    while i < end and 48 <= buf[i] <= 57:
+        value = value * 10 + (int(buf[i]) - 48)
+        digits += 1
+        i += 1
+    return (-value if negative else value), i, digits
+
+def _grow_bounds(bounds, x, y):
+    """Grow [min x, max x, min y, max y] bounds to include (x, y)"""
+    if x < bounds[0]:
+        bounds[0] = x
+    if x > bounds[1]:
+        bounds[1] = x
+    if y < bounds[2]:
+        bounds[2] = y
+    if y > bounds[3]:
+        bounds[3] = y
+
+def _scan_ops(buf, coord_scale, aperture, cur_x, cur_y, starts, ends, path_ap,
+              flashes, flash_ap, region_pts, region_ends, bounds):
+    """Scan operation lines of a Gerber buffer into preallocated arrays.
+    
+    Mirrors the regex parser line for line, except that % commands are
+    skipped. Returns (paths, flashes, region points, regions, aperture, x, y),
+    with paths set to -1 when a coordinate is too long for 64-bit integers.
+    """
+    n = len(buf)
+    n_paths = n_flashes = n_pts = n_regions = 0
+    committed = 0  # Region points before this index belong to closed regions
+    in_region = False
+    pos = 0
+    while pos < n:
+        end = pos
+        while end < n and buf[end] != 10:
+            end += 1
+        next_pos = end + 1
+        
+        # Strip ASCII whitespace
+        while pos < end and (buf[pos] == 32 or 9 <= buf[pos] <= 13):
+            pos += 1
+        while end > pos and (buf[end - 1] == 32 or 9 <= buf[end - 1] <= 13):
+            end -= 1
+        
+        is_op = False
+        if pos < end:
+            c = buf[pos]
+            if c == 68:  # 'D': aperture selection unless it is not all digits
+                stop = end
+                while stop > pos + 1 and buf[stop - 1] == 42:
+                    stop -= 1
+                code, i, digits = _scan_int(buf, pos + 1, stop)
+                if digits > 0 and i == stop and buf[pos + 1] != 43 and buf[pos + 1] != 45:
+                    if code >= 10:  # Aperture codes start at 10
+                        aperture = code
+                else:
+                    is_op = True
+            elif c == 71:  # 'G': region mode or a prefixed operation
+                if end - pos >= 3 and buf[pos + 1] == 51 and buf[pos + 2] == 54:  # G36
+                    in_region = True
+                    n_pts = committed
+                elif end - pos >= 3 and buf[pos + 1] == 51 and buf[pos + 2] == 55:  # G37
+                    if n_pts > committed:
+                        region_ends[n_regions] = n_pts
+                        n_regions += 1
+                        committed = n_pts
+                    in_region = False
+                else:
+                    is_op = True
+            elif c == 88 or c == 89:  # 'X' or 'Y'
+                is_op = True
+        
+        if is_op:
+            # Same grammar as _RE_OP
+            i = pos
+            ok = True
+            if buf[i] == 71:  # G0?[123]
+                if i + 2 < end and buf[i + 1] == 48 and 49 <= buf[i + 2] <= 51:
+                    i += 3
+                elif i + 1 < end and 49 <= buf[i + 1] <= 51:
+                    i += 2
+                else:
+                    ok = False
+            x = cur_x
+            y = cur_y
+            for axis in (88, 89, 73, 74):  # X, Y, I, J
+                if ok and i < end and buf[i] == axis:
+                    value, i, digits = _scan_int(buf, i + 1, end)
+                    if digits == 0:
+                        ok = False
+                    elif digits > 18:
+                        return -1, 0, 0, 0, aperture, cur_x, cur_y
+                    elif axis == 88:
+                        x = value * coord_scale
+                    elif axis == 89:
+                        y = value * coord_scale
+            op = 0
+            if ok and i + 2 < end and buf[i] == 68 and buf[i + 1] == 48 and 49 <= buf[i + 2] <= 51:
+                op = int(buf[i + 2])  # D01-D03
+            if op:
+                if op == 49:  # Draw
+                    _grow_bounds(bounds, cur_x, cur_y)
+                    _grow_bounds(bounds, x, y)
+                    if in_region:
+                        region_pts[n_pts, 0] = x
+                        region_pts[n_pts, 1] = y
+                        n_pts += 1
+                    else:
+                        starts[n_paths, 0] = cur_x
+                        starts[n_paths, 1] = cur_y
+                        ends[n_paths, 0] = x
+                        ends[n_paths, 1] = y
+                        path_ap[n_paths] = aperture
+                        n_paths += 1
+                elif op == 51:  # Flash
+                    _grow_bounds(bounds, x, y)
+                    flashes[n_flashes, 0] = x
+                    flashes[n_flashes, 1] = y
+                    flash_ap[n_flashes] = aperture
+                    n_flashes += 1
+                
+                cur_x = x
+                cur_y = y
+        
+        pos = next_pos
+    
+    return n_paths, n_flashes, committed, n_regions, aperture, cur_x, cur_y
+
+try:
+    from numba import njit
+except ImportError:
+    _parse_ops = None
+else:
+    _scan_int = njit(cache=True)(_scan_int)
+    _grow_bounds = njit(cache=True)(_grow_bounds)
+    _parse_ops = njit(cache=True)(_scan_ops)
+
 # Gerber parser utilities
+def make_coord_parser(scale):
+    """Coordinate parser with the file's format and unit scale baked in"""
+    def parse_coord(coord_str, current):
+        # Leading zeros are omitted, so the raw digits are the value in
+        # units of the last decimal place
+        return int(coord_str) * scale if coord_str else current
+    return parse_coord
+
 class GerberParser:
     def __init__(self):
         self.apertures = {}
-        self.current_aperture = None
-        self.current_pos = [0.0, 0.0]
-        self.paths = []
-        self.flashes = []
+        self.current_aperture = -1  # No aperture selected yet
+        self.current_pos = (0.0, 0.0)
+        # Paths and flashes are collected as flat lists and returned as arrays
+        self.path_starts = []
+        self.path_ends = []
+        self.path_apertures = []
+        self.flash_positions = []
+        self.flash_apertures = []
         self.regions = []
         self.current_region = None
+        self.in_region = False
+        self.bounds = [float('inf'), float('-inf'), float('inf'), float('-inf')]  # min/max x, min/max y
         self.unit_scale = 1.0  # mm
         self.format_spec = (2, 4)  # Default format
+        self.set_format()
         
     def parse_aperture_definition(self, line):
         """Parse aperture definition like %ADD10C,0.254*%"""
-        match = re.match(r'%ADD(\d+)([CRO])(.*?)\*%', line)
+        match = _RE_ADD.match(line)
         if match:
             code = int(match.group(1))
-            shape = match.group(2)
-            params = match.group(3).split(',') if match.group(3) else []
+            shape = match.group(2).decode('ascii')
+            params = match.group(3).split(b',') if match.group(3) else []
             
             aperture = {'shape': shape, 'params': [float(p) for p in params if p]}
             self.apertures[code] = aperture
             
-    def parse_coordinate(self, coord_str, axis):
-        """Parse Gerber coordinate string"""
-        if not coord_str:
-            return self.current_pos[0 if axis == 'X' else 1]
-        
-        integer_digits, decimal_digits = self.format_spec
-        total_digits = integer_digits + decimal_digits
-        
-        # Pad with leading zeros if needed
-        coord_str = coord_str.zfill(total_digits)
-        
-        # Split into integer and decimal parts
-        int_part = coord_str[:-decimal_digits] if decimal_digits > 0 else coord_str
-        dec_part = coord_str[-decimal_digits:] if decimal_digits > 0 else '0'
-        
-        value = float(f"{int_part}.{dec_part}")
-        return value * self.unit_scale
+    def set_format(self, format_spec=None, unit_scale=None):
+        """Update the coordinate format and/or units and rebuild the coordinate parser"""
+        if format_spec is not None:
+            self.format_spec = format_spec
+        if unit_scale is not None:
+            self.unit_scale = unit_scale
+        self._coord_scale = 10 ** -self.format_spec[1] * self.unit_scale
+        self._parse_coord = make_coord_parser(self._coord_scale)
+    
+    def _handle_percent(self, line):
+        """Extended commands: aperture definitions, format and units"""
+        if line[:4] == b'%ADD':
+            self.parse_aperture_definition(line)
+        elif line[:5] == b'%FSLA':
+            format_match = _RE_FS.match(line)
+            if format_match:
+                self.set_format(format_spec=(int(format_match.group(1)), int(format_match.group(2))))
+        elif line[:7] == b'%MOMM*%':
+            self.set_format(unit_scale=1.0)
+        elif line[:7] == b'%MOIN*%':
+            self.set_format(unit_scale=25.4)
+    
+    def _handle_d(self, line):
+        """Aperture selection like D10*"""
+        code = line[1:].rstrip(b'*')
+        if code.isdigit():
+            if int(code) >= 10:  # Aperture codes start at 10
+                self.current_aperture = int(code)
+        else:
+            self._handle_operation(line)
+    
+    def _handle_g(self, line):
+        """Region mode (G36/G37) or an operation with a G01-G03 prefix"""
+        if line[:3] == b'G36':
+            self.in_region = True
+            self.current_region = []
+        elif line[:3] == b'G37':
+            if self.current_region:
+                self.regions.append(self.current_region)
+                self.current_region = None
+            self.in_region = False
+        else:
+            self._handle_operation(line)
+    
+    def _handle_operation(self, line):
+        """Operations (D01=draw, D02=move, D03=flash)"""
+        match = _RE_OP.match(line)
+        if not match:
+            return
+        x_str, y_str, op = match.groups()
+        
+        x = self._parse_coord(x_str, self.current_pos[0])
+        y = self._parse_coord(y_str, self.current_pos[1])
+        
+        if op == b'1':  # Draw
+            self.extend_bounds(*self.current_pos)
+            self.extend_bounds(x, y)
+            if self.in_region and self.current_region is not None:
+                self.current_region.append([x, y])
+            else:
+                self.path_starts.append(self.current_pos)
+                self.path_ends.append((x, y))
+                self.path_apertures.append(self.current_aperture)
+        elif op == b'3':  # Flash
+            self.extend_bounds(x, y)
+            self.flash_positions.append((x, y))
+            self.flash_apertures.append(self.current_aperture)
+        
+        self.current_pos = (x, y)
+    
+    def extend_bounds(self, x, y):
+        """Grow the board bounds to include a drawn or flashed point"""
+        b = self.bounds
+        if x < b[0]:
+            b[0] = x
+        if x > b[1]:
+            b[1] = x
+        if y < b[2]:
+            b[2] = y
+        if y > b[3]:
+            b[3] = y
+    
+    # Dispatch on the first character of each line
+    _HANDLERS = {
+        b'%': _handle_percent,
+        b'D': _handle_d,
+        b'G': _handle_g,
+        b'X': _handle_operation,
+        b'Y': _handle_operation,
+    }
     
     def parse_file(self, filepath):
         """Parse a Gerber file"""
-        with open(filepath, 'r', encoding='utf-8', errors='ignore') as f:
-            content = f.read()
-        
-        # Parse format specification
-        format_match = re.search(r'%FSLAX(\d)(\d)Y(\d)(\d)\*%', content)
-        if format_match:
-            self.format_spec = (int(format_match.group(1)), int(format_match.group(2)))
-        
-        # Parse units
-        if '%MOMM*%' in content:
-            self.unit_scale = 1.0
-        elif '%MOIN*%' in content:
-            self.unit_scale = 25.4
-        
-        lines = content.split('\n')
-        in_region = False
-        
-        for line in lines:
-            line = line.strip()
-            
-            # Aperture definitions
-            if line.startswith('%ADD'):
-                self.parse_aperture_definition(line)
+        with open(filepath, 'rb') as f:
+            # Files with a standard format statement take the compiled path
+            if _parse_ops is not None:
+                content = f.read()
+                format_match = _RE_FS.search(content)
+                if format_match:
+                    if b'%MOMM*%' in content:
+                        self.unit_scale = 1.0
+                    elif b'%MOIN*%' in content:
+                        self.unit_scale = 25.4
+                    self.set_format(format_spec=(int(format_match.group(1)), int(format_match.group(2))))
+                    if self.parse_compiled(content):
+                        return self.results()
+                f.seek(0)
             
-            # Aperture selection
-            elif line.startswith('D') and line[1:].rstrip('*').isdigit():
-                code = int(line[1:].rstrip('*'))
-                if code >= 10:  # Aperture codes start at 10
-                    self.current_aperture = code
+            handlers = self._HANDLERS
             
-            # Region mode
-            elif line.startswith('G36'):
-                in_region = True
-                self.current_region = []
-            elif line.startswith('G37'):
-                if self.current_region:
-                    self.regions.append(self.current_region)
-                    self.current_region = None
-                in_region = False
-            
-            # Operations (D01=draw, D02=move, D03=flash)
-            elif 'D01' in line or 'D02' in line or 'D03' in line:
-                x_match = re.search(r'X([+-]?\d+)', line)
-                y_match = re.search(r'Y([+-]?\d+)', line)
-                
-                x = self.parse_coordinate(x_match.group(1) if x_match else None, 'X')
-                y = self.parse_coordinate(y_match.group(1) if y_match else None, 'Y')
-                
-                if 'D01' in line:  # Draw
-                    if in_region and self.current_region is not None:
-                        self.current_region.append([x, y])
-                    else:
-                        self.paths.append({
-                            'start': list(self.current_pos),
-                            'end': [x, y],
-                            'aperture': self.current_aperture
-                        })
-                elif 'D03' in line:  # Flash
-                    self.flashes.append({
-                        'pos': [x, y],
-                        'aperture': self.current_aperture
-                    })
-                
-                self.current_pos = [x, y]
-        
+            # Format and units are applied as their statements stream past
+            for line in f:
+                # Blank and unhandled lines are skipped before any stripping
+                if line[:1] in b' \t':
+                    line = line.strip()
+                handler = handlers.get(line[:1])
+                if handler:
+                    handler(self, line.rstrip())
+        
+        return self.results()
+    
+    def parse_compiled(self, content):
+        """Parse operations with the numba scanner; False means fall back to regex"""
+        buf = np.frombuffer(content, dtype=np.uint8)
+        max_ops = content.count(b'\n') + 1
+        starts = np.empty((max_ops, 2), dtype=np.float32)
+        ends = np.empty((max_ops, 2), dtype=np.float32)
+        path_ap = np.empty(max_ops, dtype=np.int32)
+        flashes = np.empty((max_ops, 2), dtype=np.float32)
+        flash_ap = np.empty(max_ops, dtype=np.int32)
+        region_pts = np.empty((max_ops, 2), dtype=np.float64)
+        region_ends = np.empty(max_ops, dtype=np.int64)
+        bounds = np.array(self.bounds, dtype=np.float64)
+        
+        n_paths, n_flashes, n_pts, n_regions, aperture, x, y = _parse_ops(
+            buf, self._coord_scale, self.current_aperture, *self.current_pos,
+            starts, ends, path_ap, flashes, flash_ap, region_pts, region_ends, bounds
+        )
+        if n_paths < 0:
+            return False
+        
+        for block in _RE_ADD_BLOCK.finditer(content):
+            self.parse_aperture_definition(block.group())
+        
+        # Copy out the used rows so the line-count sized buffers can be freed
+        self.path_starts = starts[:n_paths].copy()
+        self.path_ends = ends[:n_paths].copy()
+        self.path_apertures = path_ap[:n_paths].copy()
+        self.flash_positions = flashes[:n_flashes].copy()
+        self.flash_apertures = flash_ap[:n_flashes].copy()
+        self.regions = np.split(region_pts[:n_pts].copy(), region_ends[:n_regions - 1]) if n_regions else []
+        self.current_aperture = aperture
+        self.current_pos = (x, y)
+        self.bounds = bounds.tolist()
+        return True
+    
+    def results(self):
+        """Parsed geometry, with paths and flashes as arrays"""
         return {
-            'paths': self.paths,
-            'flashes': self.flashes,
+            'path_starts': np.asarray(self.path_starts, dtype=np.float32).reshape(-1, 2),
+            'path_ends': np.asarray(self.path_ends, dtype=np.float32).reshape(-1, 2),
+            'path_apertures': np.asarray(self.path_apertures, dtype=np.int32),
+            'flash_positions': np.asarray(self.flash_positions, dtype=np.float32).reshape(-1, 2),
+            'flash_apertures': np.asarray(self.flash_apertures, dtype=np.int32),
             'regions': self.regions,
-            'apertures': self.apertures
+            'apertures': self.apertures,
+            'bounds': self.bounds
         }
 
 class DrillParser:
@@ -145,235 +393,353 @@ class DrillParser:
         
     def parse_file(self, filepath):
         """Parse Excellon drill file"""
-        with open(filepath, 'r', encoding='utf-8', errors='ignore') as f:
-            lines = f.readlines()
-        
-        current_tool = None
-        unit_scale = 25.4  # Default to inches
-        
-        for line in lines:
-            line = line.strip()
+        with open(filepath, 'rb') as f:
+            current_tool = None
+            unit_scale = 25.4  # Default to inches
             
-            # Unit specification
-            if line == 'METRIC':
-                unit_scale = 1.0
-            elif line == 'INCH':
-                unit_scale = 25.4
-            
-            # Tool definition
-            if line.startswith('T') and 'C' in line:
-                match = re.match(r'T(\d+)C([\d.]+)', line)
-                if match:
-                    tool_num = int(match.group(1))
-                    diameter = float(match.group(2)) * unit_scale
-                    self.tools[tool_num] = diameter
-            
-            # Tool selection
-            elif line.startswith('T') and line[1:].isdigit():
-                current_tool = int(line[1:])
-            
-            # Hole coordinates
-            elif line.startswith('X') and 'Y' in line:
-                x_match = re.search(r'X([+-]?[\d.]+)', line)
-                y_match = re.search(r'Y([+-]?[\d.]+)', line)
-                if x_match and y_match and current_tool:
-                    x = float(x_match.group(1)) * unit_scale
-                    y = float(y_match.group(1)) * unit_scale
+            for line in f:
+                line = line.strip()
+                
+                # Unit specification
+                if line == b'METRIC':
+                    unit_scale = 1.0
+                elif line == b'INCH':
+                    unit_scale = 25.4
+                
+                # Tool definition
+                if line.startswith(b'T') and b'C' in line:
+                    match = _RE_TC.match(line)
+                    if match:
+                        tool_num = int(match.group(1))
+                        diameter = float(match.group(2)) * unit_scale
+                        self.tools[tool_num] = diameter
+                
+                # Tool selection
+                elif line.startswith(b'T') and line[1:].isdigit():
+                    current_tool = int(line[1:])
+                
+                # Hole coordinates
+                elif line.startswith(b'X') and b'Y' in line and current_tool:
+                    y_index = line.find(b'Y')
+                    try:
+                        x = float(line[1:y_index]) * unit_scale
+                        y = float(line[y_index + 1:]) * unit_scale
+                    except ValueError:
+                        # Anything beyond a bare XnnnYnnn goes through the patterns
+                        x_match = _RE_XFLOAT.search(line)
+                        y_match = _RE_YFLOAT.search(line)
+                        if not (x_match and y_match):
+                            continue
+                        x = float(x_match.group(1)) * unit_scale
+                        y = float(y_match.group(1)) * unit_scale
                     diameter = self.tools.get(current_tool, 0.8)
                     self.holes.append({'pos': [x, y], 'diameter': diameter})
         
         return self.holes
 
 # Blender mesh creation
-def create_pcb_layer(name, data, color, thickness, z_offset):
-    """Create a mesh for a PCB layer"""
-    mesh = bpy.data.meshes.new(name)
-    obj = bpy.data.objects.new(name, mesh)
-    bpy.context.collection.objects.link(obj)
-    
-    bm = bmesh.new()
-    
-    # Create paths
-    for path in data.get('paths', []):
-        aperture = data['apertures'].get(path['aperture'])
-        if aperture:
-            width = aperture['params'][0] if aperture['params'] else 0.254
-            create_trace(bm, path['start'], path['end'], width, z_offset, thickness)
-    
-    # Create flashes (pads)
-    for flash in data.get('flashes', []):
-        aperture = data['apertures'].get(flash['aperture'])
+# Shared angle table for circular pads and drill holes
+_SEG = 16
+_COS = np.cos(np.arange(_SEG) * 2 * np.pi / _SEG).astype(np.float32)
+_SIN = np.sin(np.arange(_SEG) * 2 * np.pi / _SEG).astype(np.float32)
+
+# Face topology of the 8-vertex box used for traces and rectangular pads,
+# as (loop vertex indices, loops per face, vertex count)
+BOX_TOPOLOGY = (
+    np.array([
+        0, 1, 2, 3,  # Bottom
+        4, 7, 6, 5,  # Top
+        0, 4, 5, 1,  # Side
+        1, 5, 6, 2,  # Side
+        2, 6, 7, 3,  # Side
+        3, 7, 4, 0,  # Side
+    ], dtype=np.int32),
+    np.full(6, 4, dtype=np.int32),
+    8,
+)
+
+@functools.lru_cache(maxsize=None)
+def prism_topology(n):
+    """Face topology of an n-sided prism whose bottom ring precedes its top ring"""
+    ring = np.arange(n, dtype=np.int32)
+    next_ring = np.roll(ring, -1)
+    sides = np.stack([ring, next_ring, next_ring + n, ring + n], axis=1).ravel()
+    loops = np.concatenate([ring, ring[::-1] + n, sides])
+    totals = np.concatenate([[n, n], np.full(n, 4)]).astype(np.int32)
+    return loops, totals, 2 * n
+
+def tile_topology(topology, count):
+    """Loop and loop-total buffers for count consecutive copies of one topology"""
+    loops, totals, n_verts = topology
+    offsets = np.arange(count, dtype=np.int32) * n_verts
+    loops_np = (loops[None, :] + offsets[:, None]).ravel()
+    return loops_np, np.tile(totals, count)
+
+def extrude_rings(rings_xy, z, thickness):
+    """Vertices for (N, k, 2) rings extruded from z, bottom ring first per ring"""
+    count, k = rings_xy.shape[:2]
+    verts = np.empty((count, 2 * k, 3), dtype=np.float32)
+    verts[:, :k, :2] = rings_xy
+    verts[:, k:, :2] = rings_xy
+    verts[:, :k, 2] = z
+    verts[:, k:, 2] = z + thickness
+    return verts.reshape(-1, 3)
+
+def merge_buffers(*buffers):
+    """Concatenate (verts, loops, loop_totals) buffers, offsetting vertex indices"""
+    offsets = np.cumsum([0] + [len(verts) for verts, _, _ in buffers[:-1]], dtype=np.int32)
+    return (
+        np.concatenate([verts for verts, _, _ in buffers]),
+        np.concatenate([loops + offset for (_, loops, _), offset in zip(buffers, offsets)]),
+        np.concatenate([totals for _, _, totals in buffers]),
+    )
+
+def build_buffers(prims, z, thickness):
+    """Mesh buffers for (emitter, args, topology) primitives"""
+    n_verts = sum(topology[2] for _, _, topology in prims)
+    n_loops = sum(len(topology[0]) for _, _, topology in prims)
+    n_polys = sum(len(topology[1]) for _, _, topology in prims)
+    
+    verts_np = np.empty((n_verts, 3), dtype=np.float32)
+    loops_np = np.empty(n_loops, dtype=np.int32)
+    loop_totals = np.empty(n_polys, dtype=np.int32)
+    
+    vbase = lbase = pbase = 0
+    for emit, args, (loops, totals, count) in prims:
+        emit(verts_np, vbase, *args, z, thickness)
+        loops_np[lbase:lbase + len(loops)] = loops + vbase
+        loop_totals[pbase:pbase + len(totals)] = totals
+        vbase += count
+        lbase += len(loops)
+        pbase += len(totals)
+    
+    return verts_np, loops_np, loop_totals
+
+def mesh_from_buffers(mesh, verts_np, loops_np, loop_totals):
+    """Copy flat vertex/loop/polygon buffers into an empty mesh"""
+    loop_starts = np.zeros(len(loop_totals), dtype=np.int32)
+    np.cumsum(loop_totals[:-1], out=loop_starts[1:])
+    
+    mesh.vertices.add(len(verts_np))
+    mesh.vertices.foreach_set("co", verts_np.ravel())
+    mesh.loops.add(len(loops_np))
+    mesh.loops.foreach_set("vertex_index", loops_np)
+    mesh.polygons.add(len(loop_totals))
+    mesh.polygons.foreach_set("loop_start", loop_starts)
+    # Blender 4.0+ derives loop_total from loop_start
+    if not bpy.types.MeshPolygon.bl_rna.properties['loop_total'].is_readonly:
+        mesh.polygons.foreach_set("loop_total", loop_totals)
+    mesh.update(calc_edges=True)
+
+def get_material(mat_cache, name, color, metallic=None, roughness=None):
+    """Principled BSDF material, shared between callers asking for the same settings"""
+    key = (tuple(round(c, 3) for c in color), metallic, roughness)
+    mat = mat_cache.get(key)
+    if mat is None:
+        mat = bpy.data.materials.new(name=name)
+        mat.use_nodes = True
+        bsdf = mat.node_tree.nodes.get('Principled BSDF')
+        if bsdf:
+            bsdf.inputs['Base Color'].default_value = color
+            if metallic is not None:
+                bsdf.inputs['Metallic'].default_value = metallic
+            if roughness is not None:
+                bsdf.inputs['Roughness'].default_value = roughness
+        mat_cache[key] = mat
+    return mat
+
+# Apertures flashed fewer times than this go into the layer mesh instead of
+# getting their own instanced pad object
+MIN_INSTANCED_FLASHES = 16
+
+def create_pcb_layers(layers, layer_thickness, z_positions, collection, mat_cache=None):
+    """Create one mesh for all PCB layers plus instanced pads; returns the objects"""
+    if mat_cache is None:
+        mat_cache = {}
+    
+    mesh = bpy.data.meshes.new("PCB_Layers")
+    obj = bpy.data.objects.new("PCB_Layers", mesh)
+    
+    objects = [obj]
+    buffers = []
+    material_indices = []
+    slots = {}
+    for layer_name, layer_info in layers.items():
+        z_offset, thickness = z_positions[layer_name], layer_thickness[layer_name]
+        layer = create_layer_buffers(layer_info['data'], z_offset, thickness)
+        buffers.append(layer)
+        
+        # Add material; e.g. top and bottom copper share one
+        kind = layer_name.split('_')[-1]
+        copper = kind == 'copper'
+        mat = get_material(
+            mat_cache, f"{kind.title()}_mat", layer_info['color'],
+            metallic=1.0 if copper else 0.0, roughness=0.2 if copper else 0.5
+        )
+        if mat.name not in slots:
+            slots[mat.name] = len(mesh.materials)
+            mesh.materials.append(mat)
+        material_indices.append(np.full(len(layer[2]), slots[mat.name], dtype=np.int32))
+        
+        objects += create_flash_instances(
+            layer_name.replace('_', ' ').title(), layer_info['data'], z_offset, thickness, mat, collection
+        )
+    
+    mesh_from_buffers(mesh, *merge_buffers(*buffers))
+    mesh.polygons.foreach_set("material_index", np.concatenate(material_indices))
+    collection.objects.link(obj)
+    return objects
+
+def create_layer_buffers(data, z_offset, thickness):
+    """Mesh buffers for the traces, rarely used pads and regions of one PCB layer"""
+    # Create paths; width per distinct aperture, NaN where it is undefined
+    codes, inverse = np.unique(data['path_apertures'], return_inverse=True)
+    code_widths = np.full(len(codes), np.nan, dtype=np.float32)
+    for i, code in enumerate(codes.tolist()):
+        aperture = data['apertures'].get(code)
         if aperture:
-            if aperture['shape'] == 'C':  # Circle
-                diameter = aperture['params'][0] if aperture['params'] else 0.254
-                create_circular_pad(bm, flash['pos'], diameter, z_offset, thickness)
-            elif aperture['shape'] == 'R':  # Rectangle
-                width = aperture['params'][0] if len(aperture['params']) > 0 else 0.254
-                height = aperture['params'][1] if len(aperture['params']) > 1 else width
-                create_rectangular_pad(bm, flash['pos'], width, height, z_offset, thickness)
+            code_widths[i] = aperture['params'][0] if aperture['params'] else 0.254
+    widths = code_widths[inverse.ravel()]
+    defined = ~np.isnan(widths)
+    traces = create_traces(
+        data['path_starts'][defined], data['path_ends'][defined], widths[defined],
+        z_offset, thickness
+    )
+    
+    prims = []
+    add_prim = prims.append
+    
+    # Create flashes (pads) whose apertures are not worth instancing
+    positions = data['flash_positions']
+    flash_codes = data['flash_apertures']
+    codes, counts = np.unique(flash_codes, return_counts=True)
+    for code in codes[counts < MIN_INSTANCED_FLASHES].tolist():
+        aperture = data['apertures'].get(code)
+        if aperture and aperture['shape'] in ('C', 'R'):
+            for pos in positions[flash_codes == code]:
+                add_prim(pad_prim(aperture, pos))
     
     # Create regions (filled areas)
     for region in data.get('regions', []):
         if len(region) > 2:
-            create_region(bm, region, z_offset, thickness)
+            add_prim((create_region, (region,), prism_topology(len(region))))
     
-    bm.to_mesh(mesh)
-    bm.free()
-    
-    # Add material
-    mat = bpy.data.materials.new(name=f"{name}_mat")
-    mat.use_nodes = True
-    bsdf = mat.node_tree.nodes.get('Principled BSDF')
-    if bsdf:
-        bsdf.inputs['Base Color'].default_value = color
-        bsdf.inputs['Metallic'].default_value = 1.0 if 'copper' in name.lower() else 0.0
-        bsdf.inputs['Roughness'].default_value = 0.2 if 'copper' in name.lower() else 0.5
-    
-    obj.data.materials.append(mat)
-    return obj
+    return merge_buffers(traces, build_buffers(prims, z_offset, thickness))
+
+def pad_prim(aperture, pos):
+    """(emitter, args, topology) primitive for a circular or rectangular pad"""
+    if aperture['shape'] == 'C':  # Circle
+        diameter = aperture['params'][0] if aperture['params'] else 0.254
+        return (create_circular_pad, (pos, diameter), prism_topology(_SEG))
+    # Rectangle
+    width = aperture['params'][0] if len(aperture['params']) > 0 else 0.254
+    height = aperture['params'][1] if len(aperture['params']) > 1 else width
+    return (create_rectangular_pad, (pos, width, height), BOX_TOPOLOGY)
 
-def create_trace(bm, start, end, width, z, thickness):
-    """Create a rectangular trace between two points"""
-    dx = end[0] - start[0]
-    dy = end[1] - start[1]
-    length = (dx**2 + dy**2)**0.5
+def create_flash_instances(name, data, z_offset, thickness, mat, collection):
+    """Create flashes (pads) of frequently used apertures as one instanced pad mesh each"""
+    objects = []
+    positions = data['flash_positions']
+    codes = data['flash_apertures']
+    
+    unique_codes, counts = np.unique(codes, return_counts=True)
+    for code in unique_codes[counts >= MIN_INSTANCED_FLASHES].tolist():
+        aperture = data['apertures'].get(code)
+        if not aperture or aperture['shape'] not in ('C', 'R'):
+            continue
+        
+        # Pad geometry, built once at the origin
+        pad_mesh = bpy.data.meshes.new(f"{name}_D{code}_pad")
+        mesh_from_buffers(pad_mesh, *build_buffers([pad_prim(aperture, (0.0, 0.0))], z_offset, thickness))
+        pad_mesh.materials.append(mat)
+        pad = bpy.data.objects.new(pad_mesh.name, pad_mesh)
+        collection.objects.link(pad)
+        
+        # One vertex per flash; the pad is instanced on each of them
+        verts = np.zeros((np.count_nonzero(codes == code), 3), dtype=np.float32)
+        verts[:, :2] = positions[codes == code]
+        points_mesh = bpy.data.meshes.new(f"{name}_D{code}")
+        mesh_from_buffers(points_mesh, verts, np.empty(0, dtype=np.int32), np.empty(0, dtype=np.int32))
+        instancer = bpy.data.objects.new(points_mesh.name, points_mesh)
+        collection.objects.link(instancer)
+        instancer.instance_type = 'VERTS'
+        pad.parent = instancer
+        
+        objects += [instancer, pad]
+    
+    return objects
+
+def create_traces(starts, ends, widths, z, thickness):
+    """Create rectangular traces between pairs of points"""
+    delta = ends - starts
+    length = np.hypot(delta[:, 0], delta[:, 1])
     
-    if length < 0.001:
-        return
+    keep = length >= 0.001
+    starts, ends, delta, length = starts[keep], ends[keep], delta[keep], length[keep]
     
     # Perpendicular direction
-    px = -dy / length * width / 2
-    py = dx / length * width / 2
-    
-    # Create 8 vertices (4 top, 4 bottom)
-    verts = [
-        bm.verts.new((start[0] + px, start[1] + py, z)),
-        bm.verts.new((start[0] - px, start[1] - py, z)),
-        bm.verts.new((end[0] - px, end[1] - py, z)),
-        bm.verts.new((end[0] + px, end[1] + py, z)),
-        bm.verts.new((start[0] + px, start[1] + py, z + thickness)),
-        bm.verts.new((start[0] - px, start[1] - py, z + thickness)),
-        bm.verts.new((end[0] - px, end[1] - py, z + thickness)),
-        bm.verts.new((end[0] + px, end[1] + py, z + thickness)),
-    ]
-    
-    # Create faces
-    bm.faces.new([verts[0], verts[1], verts[2], verts[3]])  # Bottom
-    bm.faces.new([verts[4], verts[7], verts[6], verts[5]])  # Top
-    bm.faces.new([verts[0], verts[4], verts[5], verts[1]])  # Side
-    bm.faces.new([verts[1], verts[5], verts[6], verts[2]])  # Side
-    bm.faces.new([verts[2], verts[6], verts[7], verts[3]])  # Side
-    bm.faces.new([verts[3], verts[7], verts[4], verts[0]])  # Side
-
-def create_circular_pad(bm, pos, diameter, z, thickness, segments=16):
-    """Create a circular pad"""
-    radius = diameter / 2
-    import math
-    
-    bottom_verts = []
-    top_verts = []
-    
-    for i in range(segments):
-        angle = (i / segments) * 2 * math.pi
-        x = pos[0] + radius * math.cos(angle)
-        y = pos[1] + radius * math.sin(angle)
-        bottom_verts.append(bm.verts.new((x, y, z)))
-        top_verts.append(bm.verts.new((x, y, z + thickness)))
-    
-    # Create faces
-    bm.faces.new(bottom_verts)
-    bm.faces.new(list(reversed(top_verts)))
+    perp = np.stack([-delta[:, 1], delta[:, 0]], axis=1) / length[:, None] * (widths[keep, None] * 0.5)
     
-    for i in range(segments):
-        next_i = (i + 1) % segments
-        bm.faces.new([bottom_verts[i], bottom_verts[next_i], 
-                     top_verts[next_i], top_verts[i]])
+    rings = np.stack([starts + perp, starts - perp, ends - perp, ends + perp], axis=1)
+    return (extrude_rings(rings, z, thickness),) + tile_topology(BOX_TOPOLOGY, len(rings))
 
-def create_rectangular_pad(bm, pos, width, height, z, thickness):
+def create_circular_pad(verts_np, vbase, pos, diameter, z, thickness):
+    """Create a circular pad"""
+    r = diameter * 0.5
+    bottom = verts_np[vbase:vbase + _SEG]
+    bottom[:, 0] = pos[0] + r * _COS
+    bottom[:, 1] = pos[1] + r * _SIN
+    bottom[:, 2] = z
+    verts_np[vbase + _SEG:vbase + 2 * _SEG] = bottom
+    verts_np[vbase + _SEG:vbase + 2 * _SEG, 2] = z + thickness
+
+def create_rectangular_pad(verts_np, vbase, pos, width, height, z, thickness):
     """Create a rectangular pad"""
     hw = width / 2
     hh = height / 2
     
-    verts = [
-        bm.verts.new((pos[0] - hw, pos[1] - hh, z)),
-        bm.verts.new((pos[0] + hw, pos[1] - hh, z)),
-        bm.verts.new((pos[0] + hw, pos[1] + hh, z)),
-        bm.verts.new((pos[0] - hw, pos[1] + hh, z)),
-        bm.verts.new((pos[0] - hw, pos[1] - hh, z + thickness)),
-        bm.verts.new((pos[0] + hw, pos[1] - hh, z + thickness)),
-        bm.verts.new((pos[0] + hw, pos[1] + hh, z + thickness)),
-        bm.verts.new((pos[0] - hw, pos[1] + hh, z + thickness)),
-    ]
-    
-    bm.faces.new([verts[0], verts[1], verts[2], verts[3]])
-    bm.faces.new([verts[4], verts[7], verts[6], verts[5]])
-    bm.faces.new([verts[0], verts[4], verts[5], verts[1]])
-    bm.faces.new([verts[1], verts[5], verts[6], verts[2]])
-    bm.faces.new([verts[2], verts[6], verts[7], verts[3]])
-    bm.faces.new([verts[3], verts[7], verts[4], verts[0]])
-
-def create_region(bm, points, z, thickness):
+    verts_np[vbase:vbase + 8] = (
+        (pos[0] - hw, pos[1] - hh, z),
+        (pos[0] + hw, pos[1] - hh, z),
+        (pos[0] + hw, pos[1] + hh, z),
+        (pos[0] - hw, pos[1] + hh, z),
+        (pos[0] - hw, pos[1] - hh, z + thickness),
+        (pos[0] + hw, pos[1] - hh, z + thickness),
+        (pos[0] + hw, pos[1] + hh, z + thickness),
+        (pos[0] - hw, pos[1] + hh, z + thickness),
+    )
+
+def create_region(verts_np, vbase, points, z, thickness):
     """Create a filled region (polygon)"""
-    if len(points) < 3:
-        return
-    
-    bottom_verts = [bm.verts.new((p[0], p[1], z)) for p in points]
-    top_verts = [bm.verts.new((p[0], p[1], z + thickness)) for p in points]
-    
-    bm.faces.new(bottom_verts)
-    bm.faces.new(list(reversed(top_verts)))
-    
-    for i in range(len(points)):
-        next_i = (i + 1) % len(points)
-        bm.faces.new([bottom_verts[i], bottom_verts[next_i], 
-                     top_verts[next_i], top_verts[i]])
+    n = len(points)
+    verts_np[vbase:vbase + n, :2] = points
+    verts_np[vbase:vbase + n, 2] = z
+    verts_np[vbase + n:vbase + 2 * n, :2] = points
+    verts_np[vbase + n:vbase + 2 * n, 2] = z + thickness
 
-def create_drill_holes(holes, board_thickness, z_offset):
+def create_drill_holes(holes, board_thickness, z_offset, collection, mat_cache=None):
     """Create drill holes"""
     if not holes:
         return None
     
     mesh = bpy.data.meshes.new("Drill_Holes")
     obj = bpy.data.objects.new("Drill_Holes", mesh)
-    bpy.context.collection.objects.link(obj)
     
-    bm = bmesh.new()
-    
-    import math
-    for hole in holes:
-        radius = hole['diameter'] / 2
-        segments = 16
-        
-        bottom_verts = []
-        top_verts = []
-        
-        for i in range(segments):
-            angle = (i / segments) * 2 * math.pi
-            x = hole['pos'][0] + radius * math.cos(angle)
-            y = hole['pos'][1] + radius * math.sin(angle)
-            bottom_verts.append(bm.verts.new((x, y, z_offset)))
-            top_verts.append(bm.verts.new((x, y, z_offset + board_thickness)))
-        
-        bm.faces.new(bottom_verts)
-        bm.faces.new(list(reversed(top_verts)))
-        
-        for i in range(segments):
-            next_i = (i + 1) % segments
-            bm.faces.new([bottom_verts[i], bottom_verts[next_i], 
-                         top_verts[next_i], top_verts[i]])
+    # Every hole is the same ring, so all vertices come from one broadcast
+    positions = np.asarray([hole['pos'] for hole in holes], dtype=np.float32)
+    radii = np.asarray([hole['diameter'] * 0.5 for hole in holes], dtype=np.float32)
+    ring_xy = np.stack([_COS, _SIN], axis=1)
+    rings = positions[:, None, :] + radii[:, None, None] * ring_xy[None, :, :]
     
-    bm.to_mesh(mesh)
-    bm.free()
+    loops_np, loop_totals = tile_topology(prism_topology(_SEG), len(holes))
+    mesh_from_buffers(mesh, extrude_rings(rings, z_offset, board_thickness), loops_np, loop_totals)
     
     # Material
-    mat = bpy.data.materials.new(name="Drill_mat")
-    mat.use_nodes = True
-    bsdf = mat.node_tree.nodes.get('Principled BSDF')
-    if bsdf:
-        bsdf.inputs['Base Color'].default_value = (0.05, 0.05, 0.05, 1.0)
-        bsdf.inputs['Metallic'].default_value = 0.8
-    
+    if mat_cache is None:
+        mat_cache = {}
+    mat = get_material(mat_cache, "Drill_mat", (0.05, 0.05, 0.05, 1.0), metallic=0.8)
     obj.data.materials.append(mat)
+    collection.objects.link(obj)
     return obj
 
 # Operator
@@ -437,6 +803,7 @@ class ImportGerber(bpy.types.Operator, ImportHelper):
         
         layers = {}
         drill_file = None
+        mat_cache = {}  # Materials shared across layers, keyed by their settings
         
         # Parse all files
         for file_elem in self.files:
@@ -487,44 +854,40 @@ class ImportGerber(bpy.types.Operator, ImportHelper):
             'bottom_silkscreen': self.import_bottom_silkscreen,
         }
         
-        for layer_name, layer_info in layers.items():
-            if import_flags.get(layer_name, False):
-                obj = create_pcb_layer(
-                    layer_name.replace('_', ' ').title(),
-                    layer_info['data'],
-                    layer_info['color'],
-                    layer_thickness[layer_name],
-                    z_positions[layer_name]
-                )
-                pcb_collection.objects.link(obj)
-                bpy.context.collection.objects.unlink(obj)
+        selected = {name: info for name, info in layers.items() if import_flags.get(name, False)}
+        if selected:
+            create_pcb_layers(selected, layer_thickness, z_positions, pcb_collection, mat_cache)
         
         # Create drill holes
         if drill_file and self.import_drills:
             drill_parser = DrillParser()
             holes = drill_parser.parse_file(drill_file)
             if holes:
-                obj = create_drill_holes(holes, self.board_thickness + 2 * self.copper_thickness, 0.0)
-                if obj:
-                    pcb_collection.objects.link(obj)
-                    bpy.context.collection.objects.unlink(obj)
+                create_drill_holes(
+                    holes, self.board_thickness + 2 * self.copper_thickness, 0.0, pcb_collection, mat_cache
+                )
         
         # Create substrate (FR4 board)
-        bpy.ops.mesh.primitive_cube_add()
-        substrate = bpy.context.active_object
-        substrate.name = "PCB_Substrate"
-        
-        # Calculate board bounds from all layers
-        min_x, max_x = float('inf'), float('-inf')
-        min_y, max_y = float('inf'), float('-inf')
-        
-        for layer_info in layers.values():
-            for path in layer_info['data'].get('paths', []):
-                for point in [path['start'], path['end']]:
-                    min_x = min(min_x, point[0])
-                    max_x = max(max_x, point[0])
-                    min_y = min(min_y, point[1])
-                    max_y = max(max_y, point[1])
+        verts = [
+            (-1, -1, -1), (1, -1, -1), (1, 1, -1), (-1, 1, -1),
+            (-1, -1, 1), (1, -1, 1), (1, 1, 1), (-1, 1, 1),
+        ]
+        faces = [
+            (0, 3, 2, 1), (4, 5, 6, 7),  # Bottom, top
+            (0, 1, 5, 4), (1, 2, 6, 5), (2, 3, 7, 6), (3, 0, 4, 7),  # Sides
+        ]
+        mesh = bpy.data.meshes.new("PCB_Substrate")
+        mesh.from_pydata(verts, [], faces)
+        mesh.update()
+        substrate = bpy.data.objects.new("PCB_Substrate", mesh)
+        pcb_collection.objects.link(substrate)
+        
+        # Board bounds from all layers, tracked while parsing
+        bounds = [layer_info['data']['bounds'] for layer_info in layers.values()]
+        min_x = min((b[0] for b in bounds), default=float('inf'))
+        max_x = max((b[1] for b in bounds), default=float('-inf'))
+        min_y = min((b[2] for b in bounds), default=float('inf'))
+        max_y = max((b[3] for b in bounds), default=float('-inf'))
         
         if min_x != float('inf'):
             center_x = (min_x + max_x) / 2
@@ -536,16 +899,8 @@ class ImportGerber(bpy.types.Operator, ImportHelper):
             substrate.scale = (width / 2, height / 2, self.board_thickness / 2)
         
         # FR4 material
-        mat = bpy.data.materials.new(name="FR4")
-        mat.use_nodes = True
-        bsdf = mat.node_tree.nodes.get('Principled BSDF')
-        if bsdf:
-            bsdf.inputs['Base Color'].default_value = (0.2, 0.25, 0.15, 1.0)
-            bsdf.inputs['Roughness'].default_value = 0.4
-        
+        mat = get_material(mat_cache, "FR4", (0.2, 0.25, 0.15, 1.0), roughness=0.4)
         substrate.data.materials.append(mat)
-        pcb_collection.objects.link(substrate)
-        bpy.context.collection.objects.unlink(substrate)
         
         self.report({'INFO'}, f"Imported {len(layers)} layers successfully")
         return {'FINISHED'}